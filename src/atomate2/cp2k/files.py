@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
 from pathlib import Path
-from tkinter import W
-from typing import Sequence
+from typing import Iterable, Sequence
 
 from pymatgen.core import Structure
-from pymatgen.io.cp2k.outputs import Cp2kOutput
+from pymatgen.io.cp2k.utils import natural_keys
 
 from atomate2 import SETTINGS
 from atomate2.common.files import copy_files, get_zfile, gunzip_files, rename_files
@@ -22,6 +24,55 @@ __all__ = ["copy_cp2k_outputs", "write_cp2k_input_set"]
 
 logger = logging.getLogger(__name__)
 
+_RELAX_RE = re.compile(r"\.relax(\d+)")
+
+# glob patterns used to identify CP2K output files, as in Cp2kOutput.parse_files
+_CP2K_FILE_PATTERNS = {
+    "DOS": ("*.dos*",),
+    "pdos": ("*pdos*",),
+    "band_structure": ("*BAND.bs*",),
+    "trajectory": ("*pos*.xyz*",),
+    "forces": ("*frc*.xyz*",),
+    "stress": ("*stress*",),
+    "cell": ("*.cell*",),
+    "ener": ("*.ener*",),
+    "electron_density": ("*ELECTRON_DENSITY*.cube*",),
+    "spin_density": ("*SPIN_DENSITY*.cube*",),
+    "v_hartree": ("*hartree*.cube*",),
+    "hyperfine_tensor": ("*HYPERFINE*eprhyp*",),
+    "g_tensor": ("*GTENSOR*data*",),
+    "spinspin_tensor": ("*K*data*",),
+    "chi_tensor": ("*CHI*data*",),
+    "nmr_shift": ("*SHIFT*data*",),
+    "raman": ("*raman*data*",),
+    "restart": ("*restart*",),
+    "wfn": ("*.wfn*", "*.kp*"),
+}
+_CP2K_FILE_TYPES = (
+    "DOS",
+    "PDOS",
+    "LDOS",
+    "band_structure",
+    "trajectory",
+    "forces",
+    "stress",
+    "cell",
+    "ener",
+    "electron_density",
+    "spin_density",
+    "v_hartree",
+    "hyperfine_tensor",
+    "g_tensor",
+    "spinspin_tensor",
+    "chi_tensor",
+    "nmr_shift",
+    "raman",
+    "restart",
+    "restart.bak",
+    "wfn",
+    "wfn.bak",
+)
+
 
 @auto_fileclient
 def copy_cp2k_outputs(
@@ -57,39 +108,43 @@ def copy_cp2k_outputs(
     """
     src_dir = strip_hostname(src_dir)  # TODO: Handle hostnames properly.
     logger.info(f"Copying CP2K inputs from {src_dir}")
-    relax_ext = get_largest_relax_extension(src_dir, src_host, file_client=file_client)
     directory_listing = file_client.listdir(src_dir, host=src_host)
+    relax_ext = get_largest_relax_extension(
+        src_dir, src_host, directory_listing=directory_listing, file_client=file_client
+    )
     restart_file = None
 
     # find required files
-    # TODO Using "parse_files" from Cp2kOutput to find and sort files. Should this just be done here?
-    o = Cp2kOutput(src_dir / get_zfile(directory_listing, "cp2k.out"), auto_load=False)
-    o.parse_files()
+    filenames = _classify_cp2k_files(directory_listing)
+    # the last file of each type after natural sorting, e.g. the latest restart file
+    name_map = {k: v[-1] for k, v in filenames.items() if v}
+    extra_files = list(additional_cp2k_files)
     if restart_to_input:
-        additional_cp2k_files += ('restart',)
-        restart_file = Path(o.filenames['restart']).name if o.filenames['restart'] else None
+        extra_files.append("restart")
+        restart_file = name_map.get("restart")
 
     #TODO it looks like in the vasp version, wavecar/chgcar are not copied by default. Seems odd?
-    additional_cp2k_files += ('wfn',)
-    files = ["cp2k.inp", "cp2k.out"] + [
-        Path(o.filenames[f]).name if isinstance(o.filenames[f], str) else Path(o.filenames[f][-1]).name
-        for f in set(additional_cp2k_files) 
-        if o.filenames.get(f)
-    ]
+    extra_files.append("wfn")
+    extra_files = frozenset(extra_files)
+    files = ["cp2k.inp", "cp2k.out"]
+    files += [name_map[f] for f in extra_files if f in name_map]
     all_files = [get_zfile(directory_listing, r + relax_ext) for r in files]
 
-    copy_files(
-        src_dir,
-        src_host=src_host,
-        include_files=all_files,
-        file_client=file_client,
-    )
-
-    gunzip_files(
-        include_files=all_files,
-        allow_missing=True,
-        file_client=file_client,
-    )
+    if src_host is None:
+        # copy and gunzip each file independently so transfers overlap
+        # decompression; remote hosts share a single SFTP connection so are
+        # handled serially
+        max_workers = min(len(all_files), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_copy_and_gunzip, src_dir, f, src_host, file_client)
+                for f in all_files
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for f in all_files:
+            _copy_and_gunzip(src_dir, f, src_host, file_client)
 
     # rename files to remove relax extension
     if relax_ext:
@@ -105,10 +160,45 @@ def copy_cp2k_outputs(
 
     logger.info("Finished copying inputs")
 
+
+def _copy_and_gunzip(
+    src_dir: Path | str,
+    filename: Path,
+    src_host: str | None,
+    file_client: FileClient,
+):
+    """
+    Copy a single file to the current directory and gunzip it if necessary.
+
+    Parameters
+    ----------
+    src_dir : str or Path
+        The source directory.
+    filename : Path
+        The file name, relative to ``src_dir``.
+    src_host : str or None
+        The source hostname used to specify a remote filesystem.
+    file_client : .FileClient
+        A file client to use for performing file operations.
+    """
+    copy_files(
+        src_dir,
+        src_host=src_host,
+        include_files=[filename],
+        file_client=file_client,
+    )
+    gunzip_files(
+        include_files=[filename],
+        allow_missing=True,
+        file_client=file_client,
+    )
+
+
 @auto_fileclient
 def get_largest_relax_extension(
     directory: Path | str,
     host: str | None = None,
+    directory_listing: list[Path] | None = None,
     file_client: FileClient | None = None,
 ) -> str:
     """
@@ -125,6 +215,9 @@ def get_largest_relax_extension(
         The hostname used to specify a remote filesystem. Can be given as either
         "username@remote_host" or just "remote_host" in which case the username will be
         inferred from the current user. If ``None``, the local filesystem will be used.
+    directory_listing : list of Path or None
+        A previously obtained listing of ``directory``. If given, the directory will
+        not be listed again.
     file_client : .FileClient
         A file client to use for performing file operations.
 
@@ -133,13 +226,93 @@ def get_largest_relax_extension(
     str
         The relax extension or an empty string if there were not multiple relaxations.
     """
-    relax_files = file_client.glob(Path(directory) / "*.relax*", host=host)
-    if len(relax_files) == 0:
-        return ""
+    if directory_listing is not None:
+        max_relax = _max_relax_number(f.name for f in directory_listing)
+    elif host is None:
+        max_relax = _scandir_relax(directory)
+    else:
+        relax_files = file_client.glob(Path(directory) / "*.relax*", host=host)
+        max_relax = _max_relax_number(f.name for f in relax_files)
+
+    return f".relax{max_relax}" if max_relax >= 0 else ""
+
+
+def _classify_cp2k_files(directory_listing: list[Path]) -> dict[str, list[str]]:
+    """
+    Classify the files in a CP2K output directory listing.
+
+    This mirrors the file identification in :obj:`.Cp2kOutput.parse_files` but works
+    on an existing directory listing, avoiding a second scan of the directory and
+    parsing of the CP2K output file.
+
+    Parameters
+    ----------
+    directory_listing : list of Path
+        A list of files in a directory.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping file types (e.g., "restart", "wfn") to a naturally sorted
+        list of matching file names.
+    """
+    filenames: dict[str, list[str]] = {k: [] for k in _CP2K_FILE_TYPES}
+    for file in directory_listing:
+        name = file.name
+        for file_type, patterns in _CP2K_FILE_PATTERNS.items():
+            if not any(fnmatchcase(name, pattern) for pattern in patterns):
+                continue
+
+            if file_type == "pdos":
+                file_type = "LDOS" if "list" in name else "PDOS"
+            elif file_type in ("restart", "wfn") and "bak" in name:
+                file_type += ".bak"
+            filenames[file_type].append(name)
+
+    for names in filenames.values():
+        names.sort(key=natural_keys)
+    return filenames
+
+
+def _scandir_relax(directory: Path | str) -> int:
+    """
+    Find the largest relax number in a local directory using a single scandir pass.
+
+    Parameters
+    ----------
+    directory : str or Path
+        A local directory to search.
+
+    Returns
+    -------
+    int
+        The largest relax number, or -1 if no relax files were found.
+    """
+    with os.scandir(directory) as it:
+        return _max_relax_number(entry.name for entry in it)
+
+
+def _max_relax_number(filenames: Iterable[str]) -> int:
+    """
+    Get the largest relax number from an iterable of file names.
+
+    Parameters
+    ----------
+    filenames : iterable of str
+        The file names to check.
+
+    Returns
+    -------
+    int
+        The largest relax number, or -1 if no relax files were found.
+    """
+    max_relax = -1
+    for filename in filenames:
+        match = _RELAX_RE.search(filename)
+        if match:
+            max_relax = max(max_relax, int(match.group(1)))
+    return max_relax
 
-    numbers = [re.search(r".relax(\d+)", file.name).group(1) for file in relax_files]
-    max_relax = max(numbers, key=lambda x: int(x))
-    return f".relax{max_relax}"
 
 def write_cp2k_input_set(
     structure: Structure,
@@ -198,6 +371,7 @@ def write_cp2k_input_set(
     logger.info("Writing CP2K input set.")
     cis.write_input(directory, **kwargs)
 
+
 @auto_fileclient
 def cleanup_cp2k_outputs(
     directory: Path | str,
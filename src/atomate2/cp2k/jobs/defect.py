@@ -6,7 +6,6 @@ import logging
 from pathlib import Path
 from dataclasses import dataclass, field
 from copy import deepcopy
-from tkinter import W
 from numpy.typing import NDArray
 
 from pymatgen.analysis.defects.core import Defect, Vacancy
@@ -8,7 +8,6 @@ import logging
 import shlex
 import subprocess
 from os.path import expandvars
-from tkinter import W
 from typing import Any, Sequence
 
 from custodian import Custodian
@@ -15,19 +15,16 @@ _TASK_TYPES = [
     "Unrecognized",
 ]
 
-_RUN_TYPES = (
-    [
-        rt
-        for functional_class in _RUN_TYPE_DATA
-        for rt in _RUN_TYPE_DATA[functional_class]
-    ]
-    + [
-        f"{rt}+U"
-        for functional_class in _RUN_TYPE_DATA
-        for rt in _RUN_TYPE_DATA[functional_class]
-    ]
-    + ["LDA", "LDA+U"]
-)
+_HUBBARD = ("", "+U")
+_KEY_TRANS = str.maketrans({"+": "_", "-": "_", "(": "_", ")": ""})
+
+_RUN_TYPES = [
+    f"{rt}{u}"
+    for u, rt in product(
+        _HUBBARD, [rt for rts in _RUN_TYPE_DATA.values() for rt in rts]
+    )
+] + [f"LDA{u}" for u in _HUBBARD]
+_RUN_TYPE_KEYS = {rt: "_".join(rt.split()).translate(_KEY_TRANS) for rt in _RUN_TYPES}
 
 
 def get_enum_source(enum_name, doc, items):
@@ -43,12 +40,7 @@ class {enum_name}(ValueEnum):
 run_type_enum = get_enum_source(
     "RunType",
     "CP2K calculation run types",
-    dict(
-        {
-            "_".join(rt.split()).replace("+", "_").replace("-", "_"): rt
-            for rt in _RUN_TYPES
-        }
-    ),
+    {key: rt for rt, key in _RUN_TYPE_KEYS.items()},
 )
 task_type_enum = get_enum_source(
     "TaskType",
@@ -59,7 +51,7 @@ calc_type_enum = get_enum_source(
     "CalcType",
     "CP2K calculation types",
     {
-        f"{'_'.join(rt.split()).replace('+','_').replace('-','_')}_{'_'.join(tt.split())}": f"{rt} {tt}"
+        f"{_RUN_TYPE_KEYS[rt]}_{'_'.join(tt.split())}": f"{rt} {tt}"
         for rt, tt in product(_RUN_TYPES, _TASK_TYPES)
     },
 )
@@ -1,25 +1,31 @@
-from datetime import datetime
-from tokenize import group
-from typing import ClassVar, Dict, Tuple, Mapping, List
-from pydantic import BaseModel, Field
-from pydantic import validator
-from itertools import groupby
+from __future__ import annotations
 
-from monty.json import MontyDecoder 
+import json
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import ClassVar, Dict, List, Mapping, Tuple
 
-from pymatgen.core import Structure
-from pymatgen.entries.computed_entries import ComputedStructureEntry
+from monty.json import MontyDecoder, MontyEncoder
+from monty.tempfile import ScratchDir
+from pydantic import Field, validator
 from pymatgen.analysis.defects.core import Defect
-from pymatgen.analysis.defects.corrections import get_correction
+from pymatgen.analysis.defects.corrections.freysoldt import get_freysoldt_correction
 from pymatgen.analysis.defects.thermo import DefectEntry, DefectSiteFinder
+from pymatgen.core import Structure
+from pymatgen.entries.computed_entries import ComputedStructureEntry
+from pymatgen.io.vasp.outputs import VolumetricData
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
-from atomate2 import SETTINGS
 
+from atomate2 import SETTINGS
 from atomate2.common.schemas.structure import StructureMetadata
+from atomate2.cp2k.schemas.calc_types.enums import CalcType, RunType, TaskType
 from atomate2.cp2k.schemas.calc_types.utils import run_type, task_type
-from atomate2.cp2k.schemas.calc_types.enums import CalcType, TaskType, RunType
 from atomate2.cp2k.schemas.task import TaskDocument
 
+_MONTY_DECODER = MontyDecoder()
+
+
 class DefectDoc(StructureMetadata):
     """
     A document used to represent a single defect. e.g. a O vacancy with a -2 charge.
@@ -81,52 +87,89 @@ class DefectDoc(StructureMetadata):
     def decode(cls, entries):
         for e in entries:
             if isinstance(entries[e], dict):
-                entries[e] = MontyDecoder().process_decoded({k: v for k, v in entries[e].items()})
+                entries[e] = _MONTY_DECODER.process_decoded({k: v for k, v in entries[e].items()})
         return entries
 
     def update(self, defect_task, bulk_task, dielectric, query='defect'):
-
         defect_task_doc = TaskDocument(**defect_task)
         bulk_task_doc = TaskDocument(**bulk_task)
+        rt = self._update_with_docs(
+            defect_task_doc=defect_task_doc, bulk_task_doc=bulk_task_doc
+        )
+        if rt is not None:
+            self.entries[rt] = self.__class__.get_defect_entry_from_tasks(
+                defect_task=defect_task,
+                bulk_task=bulk_task,
+                dielectric=dielectric,
+                query=query,
+                defect_task_doc=defect_task_doc,
+                bulk_task_doc=bulk_task_doc,
+            )
 
-        rt = defect_task_doc.run_type
-        tt = defect_task_doc.task_type
-        ct = defect_task_doc.calc_type
+    def _update_with_docs(self, defect_task_doc, bulk_task_doc):
+        """
+        Update the task bookkeeping using already validated TaskDocuments.
 
-        # Metadata
-        last_updated = max(dtsk.last_updated for dtsk, btsk in self.tasks.values()) if self.tasks else datetime.now()
-        created_at = min(dtsk.last_updated for dtsk, btsk in self.tasks.values()) if self.tasks else datetime.now()
+        The defect entry is not built here. Returns the run type if this pair became
+        the best calculation for its run type (so its entry needs to be (re)built),
+        otherwise None.
+        """
+        cr0 = defect_task_doc.calcs_reversed[0]
+        rt, tt, ct = cr0.run_type, cr0.task_type, cr0.calc_type
 
         if defect_task_doc.task_id in self.task_ids:
-            return
+            return None
+
+        # Metadata; created_at is left untouched
+        self.last_updated = datetime.utcnow()
+        self.task_ids.append(defect_task_doc.task_id)
+
+        # TODO compare kpoint density; currently prefer the largest supercell, then
+        # the lowest energy, consistent with the sorting in from_tasks
+        existing = self.tasks.get(rt)
+        if existing is None:
+            replace = True
         else:
-            self.last_updated = last_updated
-            self.created_at = created_at
-            self.task_ids.append(defect_task_doc.task_id)
-
-            def _run_type(x):
-                return run_type(x[0]['input']['dft']).value
-
-            def _compare(new, old):
-                # TODO return kpoint density
-                return new['nsites'] > old.nsites
-
-            if defect_task_doc.run_type not in self.tasks or _compare(defect_task, self.tasks[rt][0]):
-                self.run_types.update({defect_task_doc.task_id: rt})
-                self.task_types.update({defect_task_doc.task_id: tt})
-                self.calc_types.update({defect_task_doc.task_id: ct})
-                entry = self.__class__.get_defect_entry_from_tasks(
-                            defect_task=defect_task,
-                            bulk_task=bulk_task,
-                            dielectric=dielectric,
-                            query=query
-                        )
-                self.entries[rt] = entry
-                self.tasks[rt] = (defect_task_doc, bulk_task_doc)
+            cur_n, new_n = existing[0].nsites, defect_task_doc.nsites
+            replace = new_n > cur_n or (
+                new_n == cur_n
+                and defect_task_doc.output.energy < existing[0].output.energy
+            )
+
+        if not replace:
+            return None
+
+        self.run_types.update({defect_task_doc.task_id: rt})
+        self.task_types.update({defect_task_doc.task_id: tt})
+        self.calc_types.update({defect_task_doc.task_id: ct})
+        self.tasks[rt] = (defect_task_doc, bulk_task_doc)
+        return rt
 
     def update_all(self, tasks, query='defect'):
+        # many defects share the same bulk task, so only validate each bulk task once
+        bulk_task_docs = {}
+        # only the final best pair for each run type needs its (expensive) entry built
+        pending = {}
         for defect_task, bulk_task, dielectric in tasks:
-            self.update(defect_task=defect_task, bulk_task=bulk_task, dielectric=dielectric, query=query)
+            if id(bulk_task) not in bulk_task_docs:
+                bulk_task_docs[id(bulk_task)] = TaskDocument(**bulk_task)
+            defect_task_doc = TaskDocument(**defect_task)
+            bulk_task_doc = bulk_task_docs[id(bulk_task)]
+            rt = self._update_with_docs(
+                defect_task_doc=defect_task_doc, bulk_task_doc=bulk_task_doc
+            )
+            if rt is not None:
+                pending[rt] = (
+                    defect_task,
+                    bulk_task,
+                    dielectric,
+                    query,
+                    defect_task_doc,
+                    bulk_task_doc,
+                )
+
+        for rt, args in pending.items():
+            self.entries[rt] = self.__class__.get_defect_entry_from_tasks(*args)
 
     @classmethod
     def from_tasks(cls, tasks: List, query='defect', material_id=None):
@@ -137,20 +180,28 @@ class DefectDoc(StructureMetadata):
                 series of DefectEntry objects.
             query: How to retrieve the defect object stored in the task.
         """
-        task_group = [TaskDocument(**defect_task) for defect_task, bulk_task, dielectric in tasks]
+        # validate each task dict once; the best tasks are looked up from these below
+        defect_task_docs = {id(t[0]): TaskDocument(**t[0]) for t in tasks}
+        bulk_task_docs = {}
+        for _, bulk_task, _ in tasks:
+            if id(bulk_task) not in bulk_task_docs:
+                bulk_task_docs[id(bulk_task)] = TaskDocument(**bulk_task)
+        task_group = list(defect_task_docs.values())
 
         # Metadata
-        last_updated = datetime.now() or max(task.last_updated for task in task_group)
-        created_at = datetime.now() or min(task.completed_at for task in task_group)
+        last_updated = created_at = datetime.utcnow()
         task_ids = {task.task_id for task in task_group}
 
         deprecated_tasks = list(
             {task.task_id for task in task_group if not task.is_valid}
         )
 
-        run_types = {task.task_id: task.run_type for task in task_group}
-        task_types = {task.task_id: task.task_type for task in task_group}
-        calc_types = {task.task_id: task.calc_type for task in task_group}
+        run_types, task_types, calc_types = {}, {}, {}
+        for task in task_group:
+            cr0 = task.calcs_reversed[0]
+            run_types[task.task_id] = cr0.run_type
+            task_types[task.task_id] = cr0.task_type
+            calc_types[task.task_id] = cr0.calc_type
 
         def _run_type(x):
             return run_type(x[0]['input']['dft']).value
@@ -165,16 +216,33 @@ class DefectDoc(StructureMetadata):
         entries = {}
         final_tasks = {}
         metadata = {}
-        for key, tasks_for_runtype in groupby(sorted(tasks, key=_run_type), key=_run_type):
+        tasks_by_runtype = defaultdict(list)
+        for t in tasks:
+            tasks_by_runtype[_run_type(t)].append(t)
+
+        for key, tasks_for_runtype in tasks_by_runtype.items():
             sorted_tasks = sorted(tasks_for_runtype, key=_sort)
-            ents = [cls.get_defect_entry_from_tasks(t[0], t[1], t[2], query) for t in sorted_tasks]
+            ents = [
+                cls.get_defect_entry_from_tasks(
+                    t[0],
+                    t[1],
+                    t[2],
+                    query,
+                    defect_task_doc=defect_task_docs[id(t[0])],
+                    bulk_task_doc=bulk_task_docs[id(t[1])],
+                )
+                for t in sorted_tasks
+            ]
             best_entry = ents[0]
             best_defect_task, best_bulk_task, dielectric = sorted_tasks[0]
             metadata[key] = {'convergence': [(sorted_tasks[i][0]['nsites'], ents[i].energy) for i in range(len(ents))]}
-            best_defect_task, best_bulk_task = TaskDocument(**best_defect_task), TaskDocument(**best_bulk_task)
-            entries[best_defect_task.run_type] = best_entry
-            final_tasks[best_defect_task.run_type] = (best_defect_task, best_bulk_task)
+            best_defect_task = defect_task_docs[id(best_defect_task)]
+            best_bulk_task = bulk_task_docs[id(best_bulk_task)]
+            best_rt = best_defect_task.calcs_reversed[0].run_type
+            entries[best_rt] = best_entry
+            final_tasks[best_rt] = (best_defect_task, best_bulk_task)
 
+        defect = best_entry.defect
         data = {
                 'entries': entries,
                 'run_types': run_types,
@@ -187,16 +255,23 @@ class DefectDoc(StructureMetadata):
                 'tasks': final_tasks,
                 'material_id': material_id if material_id else best_entry.parameters['material_id'],
                 'entry_ids': {rt: entries[rt].entry_id for rt in entries},
-                'defect': best_entry.defect,
-                'name': best_entry.defect.name,
+                'defect': defect,
+                'name': defect.name,
                 'metadata': metadata,
         }
-        prim = SpacegroupAnalyzer(best_entry.defect.bulk_structure).get_primitive_standard_structure()
-        data.update(StructureMetadata.from_structure(prim).dict())
+        data.update(get_primitive_structure_metadata(defect.bulk_structure))
         return cls(**data)
 
     @classmethod
-    def get_defect_entry_from_tasks(cls, defect_task, bulk_task, dielectric=None, query='transformations.history.0.defect'):
+    def get_defect_entry_from_tasks(
+        cls,
+        defect_task,
+        bulk_task,
+        dielectric=None,
+        query='transformations.history.0.defect',
+        defect_task_doc=None,
+        bulk_task_doc=None,
+    ):
         """
         Extract a defect entry from a single pair (defect and bulk) of tasks.
 
@@ -206,18 +281,26 @@ class DefectDoc(StructureMetadata):
             dielectric: Dielectric doc if the defect is charged. If not present, no dielectric
                 corrections will be performed, even if the defect is charged.
             query: Mongo-style query to retrieve the defect object from the defect task
+            defect_task_doc: already validated TaskDocument for defect_task, if available
+            bulk_task_doc: already validated TaskDocument for bulk_task, if available
         """
-        parameters = cls.get_parameters_from_tasks(defect_task=defect_task, bulk_task=bulk_task)
+        parameters = cls.get_parameters_from_tasks(
+            defect_task=defect_task if defect_task_doc is None else defect_task_doc,
+            bulk_task=bulk_task if bulk_task_doc is None else bulk_task_doc,
+        )
         if dielectric:
             parameters['dielectric'] = dielectric
 
-        if parameters['charge_state']
-            corrections, plt_data = get_correction(
-                q=defect_entry.charge_state, dielectric=parameters['dielectric'], 
+        # neutral defects and missing dielectrics get no correction, so skip
+        # the potential alignment entirely
+        if parameters['charge_state'] and parameters.get('dielectric') is not None:
+            correction = get_freysoldt_correction(
+                q=parameters['charge_state'], dielectric=parameters['dielectric'], 
                 defect_locpot=parameters['defect_v_hartree'], 
                 bulk_locpot=parameters['bulk_v_hartree'], 
                 defect_frac_coords=parameters['defect_frac_sc_coords'],
                 )
+            corrections = {'freysoldt': correction.correction_energy}
         else:
             corrections = {}
 
@@ -228,7 +311,7 @@ class DefectDoc(StructureMetadata):
 
         defect_entry = DefectEntry(
             defect=cls.get_defect_from_task(query=query, task=defect_task),
-            charge_state=,
+            charge_state=parameters['charge_state'],
             sc_entry=sc_entry,
             sc_defect_frac_coords=parameters['defect_frac_sc_coords'],
             corrections=corrections,
@@ -242,36 +325,48 @@ class DefectDoc(StructureMetadata):
         Unpack a Mongo-style query and retrieve a defect object from a task.
         """
         defect = unpack(query.split('.'), task)
-        needed_keys = ['@module', '@class', 'structure', 'defect_site', 'charge', 'site_name']
-        return MontyDecoder().process_decoded({k: v for k, v in defect.items() if k in needed_keys})
+        needed_keys = [
+            '@module',
+            '@class',
+            'structure',
+            'site',
+            'multiplicity',
+            'oxi_state',
+            'symprec',
+            'angle_tolerance',
+            'user_charges',
+        ]
+        return _MONTY_DECODER.process_decoded({k: v for k, v in defect.items() if k in needed_keys})
 
     @classmethod
     def get_parameters_from_tasks(cls, defect_task, bulk_task):
         """
-        Get parameters necessary to create a defect entry from defect and bulk task dicts
+        Get parameters necessary to create a defect entry from defect and bulk tasks
         Args:
-            defect_task: task dict for the defect calculation
-            bulk_task: task dict for the bulk calculation
+            defect_task: task dict or TaskDocument for the defect calculation
+            bulk_task: task dict or TaskDocument for the bulk calculation
         """
-
-        defect_task = TaskDocument(**defect_task)
-        bulk_task = TaskDocument(**bulk_task)
+        if isinstance(defect_task, dict):
+            defect_task = TaskDocument(**defect_task)
+        if isinstance(bulk_task, dict):
+            bulk_task = TaskDocument(**bulk_task)
 
         final_defect_structure = defect_task.structure
         final_bulk_structure = bulk_task.structure
 
-        ghost = [index for index, prop in enumerate(final_defect_structure.site_properties.get("ghost")) if prop]
-        if ghost:
-            defect_frac_sc_coords = final_defect_structure[ghost[0]]
+        ghost_props = final_defect_structure.site_properties.get("ghost") or ()
+        ghost_idx = next((i for i, prop in enumerate(ghost_props) if prop), None)
+        if ghost_idx is not None:
+            defect_frac_sc_coords = final_defect_structure[ghost_idx].frac_coords
         else:
-            defect_frac_sc_coords = DefectSiteFinder(SETTINGS.SYMPREC).get_defect_fpos(defect_structure=final_defect_structure, base_structure=final_bulk_structure)
+            defect_frac_sc_coords = _get_defect_site_finder(SETTINGS.SYMPREC).get_defect_fpos(defect_structure=final_defect_structure, base_structure=final_bulk_structure)
 
         parameters = {
-            'defect_energy': defect_task['output']['energy'],
-            'bulk_energy': bulk_task['output']['energy'],
+            'defect_energy': defect_task.output.energy,
+            'bulk_energy': bulk_task.output.energy,
             'final_defect_structure': final_defect_structure,
-            'vbm': bulk_task['output']['vbm'],
-            'cbm': bulk_task['output']['cbm'],
+            # the defect makers set the charge on the supercell structure
+            'charge_state': int(round(final_defect_structure.charge)),
             'defect_frac_sc_coords': defect_frac_sc_coords,
             'defect_v_hartree': defect_task.cp2k_objects['v_hartree'], # TODO CP2K spec name
             'bulk_v_hartree': bulk_task.cp2k_objects['v_hartree'], # TODO CP2K spec name
@@ -290,7 +385,15 @@ class DefectDoc2d(DefectDoc):
     """
 
     @classmethod
-    def get_defect_entry_from_tasks(cls, defect_task, bulk_task, dielectric=None, query='transformations.history.0.defect'):
+    def get_defect_entry_from_tasks(
+        cls,
+        defect_task,
+        bulk_task,
+        dielectric=None,
+        query='transformations.history.0.defect',
+        defect_task_doc=None,
+        bulk_task_doc=None,
+    ):
         """
         Get defect entry from defect and bulk tasks. 
         Args:
@@ -298,8 +401,14 @@ class DefectDoc2d(DefectDoc):
             bulk_task: task dict for the bulk calculation
             dielectric: dielectric tensor for the defect calculation
             query: query string for defect entry
+            defect_task_doc: already validated TaskDocument for defect_task, if available
+            bulk_task_doc: already validated TaskDocument for bulk_task, if available
         """
-        parameters = cls.get_parameters_from_tasks(defect_task=defect_task, bulk_task=bulk_task)
+        parameters = cls.get_parameters_from_tasks(
+            defect_task=defect_task if defect_task_doc is None else defect_task_doc,
+            bulk_task=bulk_task if bulk_task_doc is None else bulk_task_doc,
+        )
+        charge_state = parameters['charge_state']
         if dielectric:
             eps_parallel = (dielectric[0][0] + dielectric[1][1]) / 2
             eps_perp = dielectric[2][2]
@@ -313,18 +422,21 @@ class DefectDoc2d(DefectDoc):
         )
 
         DefectCompatibility().process_entry(defect_entry, perform_corrections=False)
-        with ScratchDir('.'):
+        if not charge_state or defect_entry.parameters.get('dielectric') is None:
+            return defect_entry
+
+        with ScratchDir("."):
             fc = FreysoldtCorrection2d(
                     defect_entry.parameters.get('dielectric'), 
                     "LOCPOT.ref", "LOCPOT.def", encut=520, buffer=2
                 ) 
             lref = VolumetricData(
                 structure=Structure.from_dict(bulk_task['input']['structure']), 
-                data={'total': MontyDecoder().process_decoded(bulk_task['v_hartree'])}
+                data={'total': _decode(bulk_task['v_hartree'])}
             )
             ldef = VolumetricData(
                 structure=Structure.from_dict(defect_task['input']['structure']), 
-                data={'total': MontyDecoder().process_decoded(defect_task['v_hartree'])}
+                data={'total': _decode(defect_task['v_hartree'])}
             )
             lref.write_file("LOCPOT.ref")
             ldef.write_file("LOCPOT.def")
@@ -337,9 +449,49 @@ class DefectDoc2d(DefectDoc):
 
         return defect_entry
 
+def get_primitive_structure_metadata(structure: Structure) -> dict:
+    """
+    Get the StructureMetadata fields of the primitive standard structure as a dict.
+
+    The metadata is cached, so defects sharing a bulk structure only build it once.
+    """
+    return dict(_metadata_from_key(_structure_key(structure)))
+
+
+def _structure_key(structure):
+    # the full serialization includes the site properties (e.g., magmom) that
+    # affect the symmetry analysis
+    return json.dumps(structure.as_dict(), sort_keys=True, cls=MontyEncoder)
+
+
+@lru_cache(maxsize=256)
+def _metadata_from_key(key):
+    structure = Structure.from_dict(json.loads(key))
+    primitive = SpacegroupAnalyzer(structure).get_primitive_standard_structure()
+    return StructureMetadata.from_structure(primitive).dict()
+
+
+def _decode(obj):
+    """
+    Decode a serialized (dict or list) object; already decoded objects are returned as is.
+    """
+    if isinstance(obj, (dict, list)):
+        return _MONTY_DECODER.process_decoded(obj)
+    return obj
+
+
+@lru_cache(maxsize=None)
+def _get_defect_site_finder(symprec):
+    """
+    Get a DefectSiteFinder, reusing the same instance for a given symprec.
+    """
+    return DefectSiteFinder(symprec)
+
+
 def unpack(query, d):
-    if not query:
-        return d
-    if isinstance(d, List):
-        return unpack(query[1:], d.__getitem__(int(query.pop(0))))
-    return unpack(query[1:], d.__getitem__(query.pop(0)))
\ No newline at end of file
+    """
+    Walk a nested dict/list using the keys in query, e.g. ['a', '0', 'b'].
+    """
+    for key in query:
+        d = d[int(key)] if isinstance(d, list) else d[key]
+    return d
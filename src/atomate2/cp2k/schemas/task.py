@@ -1,19 +1,27 @@
 """Core definition of a CP2K task document."""
+import gzip
 import logging
+import multiprocessing
+import os
 import re
-from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
 import numpy as np
 from monty.serialization import loadfn
 from pydantic import BaseModel, Field
-from pymatgen.analysis.structure_analyzer import oxide_type
 from pymatgen.core.structure import Structure
 from pymatgen.entries.computed_entries import ComputedEntry
-from pymatgen.io.cp2k.outputs import Cp2kOutput
 from pymatgen.io.cp2k.inputs import Cp2kInput
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from atomate2 import SETTINGS, __version__
 from atomate2.common.schemas.math import Matrix3D, Vector3D
 from atomate2.common.schemas.structure import StructureMetadata
@@ -37,6 +45,9 @@ __all__ = [
 logger = logging.getLogger(__name__)
 _T = TypeVar("_T", bound="TaskDocument")
 _VOLUMETRIC_FILES = ("v_hartree", "ELECTRON_DENSITY", "SPIN_DENSITY")
+_TASK_NAMES = ("precondition",) + tuple(f"relax{i}" for i in range(9))
+_ICSD_RE = re.compile(r"(\d+)-ICSD")
+_LONG_DIGITS_RE = re.compile(rb"\d{19}")
 
 
 class AnalysisSummary(BaseModel):
@@ -65,10 +76,9 @@ class AnalysisSummary(BaseModel):
         AnalysisSummary
             The relaxation analysis.
         """
-        from atomate2.cp2k.schemas.calculation import Status
-
+        final_calc = calc_docs[-1]
         initial_vol = calc_docs[0].input.structure.lattice.volume
-        final_vol = calc_docs[-1].output.structure.lattice.volume
+        final_vol = final_calc.output.structure.lattice.volume
         delta_vol = final_vol - initial_vol
         percent_delta_vol = 100 * delta_vol / initial_vol
         warnings = []
@@ -79,7 +89,6 @@ class AnalysisSummary(BaseModel):
                 f"Volume change > {SETTINGS.CP2K_VOLUME_CHANGE_WARNING_TOL * 100}%"
             )
 
-        final_calc = calc_docs[-1]
         max_force = None
         if final_calc.has_cp2k_completed == Status.SUCCESS:
             # max force and valid structure checks
@@ -286,6 +295,7 @@ class TaskDocument(StructureMetadata):
         volumetric_files: Tuple[str, ...] = _VOLUMETRIC_FILES,
         store_additional_json: bool = SETTINGS.CP2K_STORE_ADDITIONAL_JSON,
         additional_fields: Dict[str, Any] = None,
+        max_workers: Optional[int] = None,
         **cp2k_calculation_kwargs,
     ) -> _T:
         """
@@ -301,6 +311,10 @@ class TaskDocument(StructureMetadata):
             Volumetric files to search for.
         additional_fields
             Dictionary of additional fields to add to output document.
+        max_workers
+            Number of processes used to parse multiple calculations in parallel. If
+            None (the default), the calculations are parsed serially. Parsing is
+            always serial when called from a daemonic process.
         **cp2k_calculation_kwargs
             Additional parsing options that will be passed to the
             :obj:`.Calculation.from_cp2k_files` function.
@@ -319,14 +333,23 @@ class TaskDocument(StructureMetadata):
         if len(task_files) == 0:
             raise FileNotFoundError("No CP2K files found!")
 
-        calcs_reversed = []
-        all_cp2k_objects = []
-        for task_name, files in task_files.items():
-            calc_doc, cp2k_objects = Calculation.from_cp2k_files(
-                dir_name, task_name, **files, **cp2k_calculation_kwargs
-            )
-            calcs_reversed.append(calc_doc)
-            all_cp2k_objects.append(cp2k_objects)
+        parse = partial(_parse_calculation, dir_name, cp2k_calculation_kwargs)
+        parallel = (
+            max_workers is not None
+            and max_workers > 1
+            and len(task_files) > 1
+            and not multiprocessing.current_process().daemon
+        )
+        if parallel:
+            # the calculations are independent, so parse their outputs in parallel;
+            # daemonic processes (e.g., pool workers) are not allowed children
+            max_workers = min(len(task_files), max_workers)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(parse, task_files.items()))
+        else:
+            results = [parse(item) for item in task_files.items()]
+        calcs_reversed = [calc_doc for calc_doc, _ in results]
+        all_cp2k_objects = [cp2k_objects for _, cp2k_objects in results]
 
         analysis = AnalysisSummary.from_cp2k_calc_docs(calcs_reversed)
         transformations, icsd_id, tags, author = _parse_transformations(dir_name)
@@ -406,6 +429,16 @@ class TaskDocument(StructureMetadata):
         return ComputedEntry.from_dict(entry_dict)
 
 
+def _parse_calculation(
+    dir_name: Path, cp2k_calculation_kwargs: Dict[str, Any], task: Tuple[str, Dict]
+) -> Tuple[Calculation, Dict]:
+    """Parse a single calculation; defined at module level so it can be pickled."""
+    task_name, files = task
+    return Calculation.from_cp2k_files(
+        dir_name, task_name, **files, **cp2k_calculation_kwargs
+    )
+
+
 def _find_cp2k_files(
     path: Union[str, Path],
     volumetric_files: Tuple[str, ...] = _VOLUMETRIC_FILES,
@@ -428,25 +461,28 @@ def _find_cp2k_files(
     Returns
     -------
     dict[str, Any]
-        The filenames of the calculation outputs for each CP2K task, given as a ordered
-        dictionary of::
+        The filenames of the calculation outputs for each CP2K task, given as a dictionary
+        (in task order) of::
 
             {
                 task_name: {
                     "cp2k_output_file": cp2k_output_filename,
                     "volumetric_files": [v_hartree file, e_density file, etc],
     """
-    task_names = ["precondition"] + [f"relax{i}" for i in range(9)]
     path = Path(path)
-    task_files = OrderedDict()
+    task_files = {}
 
     def _get_task_files(files, suffix=""):
         cp2k_files = {}
         vol_files = []
+        suffix = re.escape(suffix)
+        output_re = re.compile(rf"cp2k\.out{suffix}")
+        vol_names = "|".join(re.escape(f) for f in volumetric_files)
+        vol_re = re.compile(rf"(?:{vol_names}).*cube{suffix}") if vol_names else None
         for file in files:
-            if file.match(f"*cp2k.out{suffix}*"):
+            if output_re.search(file.name):
                 cp2k_files["cp2k_output_file"] = file
-            elif any([file.match(f"*{f}*cube{suffix}*") for f in volumetric_files]):
+            elif vol_re and vol_re.search(file.name):
                 vol_files.append(file)
 
         if len(vol_files) > 0:
@@ -455,9 +491,17 @@ def _find_cp2k_files(
 
         return cp2k_files
 
-    for task_name in task_names:
-        subfolder_match = list(path.glob(f"{task_name}/*"))
-        suffix_match = list(path.glob(f"*.{task_name}*"))
+    # list the directory once and match task names against that listing, rather
+    # than globbing the directory twice for every task name
+    entries = _scandir(path)
+    dir_names = {entry.name for entry in entries if entry.is_dir()}
+    for task_name in _TASK_NAMES:
+        subfolder_match = []
+        if task_name in dir_names:
+            subfolder_match = [Path(e.path) for e in _scandir(path / task_name)]
+        suffix_match = [
+            Path(e.path) for e in entries if fnmatchcase(e.name, f"*.{task_name}*")
+        ]
         if len(subfolder_match) > 0:
             # subfolder match
             task_files[task_name] = _get_task_files(subfolder_match)
@@ -469,12 +513,18 @@ def _find_cp2k_files(
 
     if len(task_files) == 0:
         # get any matching file from the root folder
-        standard_files = _get_task_files(list(path.glob("*")))
+        standard_files = _get_task_files([Path(e.path) for e in entries])
         if len(standard_files) > 0:
             task_files["standard"] = standard_files
 
     return task_files
 
+
+def _scandir(path: Path) -> List[os.DirEntry]:
+    """List the entries of a directory in a single pass."""
+    with os.scandir(path) as it:
+        return list(it)
+
 # TODO These functions seem like they do not need to be cp2k/vasp specific 
 
 def _parse_transformations(
@@ -485,9 +535,9 @@ def _parse_transformations(
     filenames = tuple(dir_name.glob("transformations.json*"))
     icsd_id = None
     if len(filenames) >= 1:
-        transformations = loadfn(filenames[0], cls=None)
+        transformations = _load_json(filenames[0])
         try:
-            match = re.match(r"(\d+)-ICSD", transformations["history"][0]["source"])
+            match = _ICSD_RE.match(transformations["history"][0]["source"])
             if match:
                 icsd_id = int(match.group(1))
         except (KeyError, IndexError):
@@ -526,7 +576,7 @@ def _parse_custodian(dir_name: Path) -> Optional[Dict]:
     """
     filenames = tuple(dir_name.glob("custodian.json*"))
     if len(filenames) >= 1:
-        return loadfn(filenames[0], cls=None)
+        return _load_json(filenames[0])
     return None
 
 
@@ -570,20 +620,44 @@ def _parse_additional_json(dir_name: Path) -> Dict[str, Any]:
     for filename in dir_name.glob("*.json*"):
         key = filename.name.split(".")[0]
         if key not in ("custodian", "transformations"):
-            additional_json[key] = loadfn(filename, cls=None)
+            additional_json[key] = _load_json(filename)
     return additional_json
 
 
+def _load_json(filename: Path) -> Any:
+    """
+    Load a json file as plain python objects.
+
+    Uses orjson for (gzipped) json files if it is installed, falling back to
+    :obj:`monty.serialization.loadfn` for other formats, json that orjson rejects
+    and json with integers that orjson would load as floats.
+    """
+    if orjson is not None and filename.name.endswith((".json", ".json.gz")):
+        data = filename.read_bytes()
+        if filename.suffix == ".gz":
+            data = gzip.decompress(data)
+        if _LONG_DIGITS_RE.search(data):
+            # integers outside the 64 bit range lose precision in orjson
+            return loadfn(filename, cls=None)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g., NaN or Infinity, which the standard library json accepts
+            pass
+    return loadfn(filename, cls=None)
+
+
 def _get_max_force(calc_doc: Calculation) -> Optional[float]:
     """Get max force acting on atoms from a calculation document."""
     forces = calc_doc.output.ionic_steps[-1].get("forces") if calc_doc.output.ionic_steps else None
     structure = calc_doc.output.structure
     if forces:
-        forces = np.array(forces)
+        forces = np.array(forces, dtype=float)
         sdyn = structure.site_properties.get("selective_dynamics")
         if sdyn:
-            forces[np.logical_not(sdyn)] = 0
-        return max(np.linalg.norm(forces, axis=1))
+            # zero the force components on fixed coordinates
+            forces *= np.asarray(sdyn, dtype=bool)
+        return float(np.sqrt(np.einsum("ij,ij->i", forces, forces).max()))
     return None
 
 
@@ -599,14 +673,8 @@ def _get_state(calc_docs: List[Calculation], analysis: AnalysisSummary) -> Statu
 
 def _get_run_stats(calc_docs: List[Calculation]) -> Dict[str, RunStatistics]:
     """Get summary of runtime statistics for each calculation in this task."""
-    run_stats = {}
-    total = dict(
-        total_time=0.0,
-    )
-    for calc_doc in calc_docs:
-        stats = calc_doc.output.run_stats
-        run_stats[calc_doc.task_name] = stats
-        total["total_time"] += stats.total_time
-    run_stats["overall"] = RunStatistics(**total)
+    run_stats = {c.task_name: c.output.run_stats for c in calc_docs}
+    total_time = sum(stats.total_time for stats in run_stats.values())
+    run_stats["overall"] = RunStatistics(total_time=total_time)
     return run_stats
 
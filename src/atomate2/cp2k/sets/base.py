@@ -6,7 +6,6 @@ import os
 from copy import deepcopy
 from dataclasses import dataclass, field
 from pathlib import Path
-from tkinter import W
 from typing import Any, Iterable, Dict
 
 import numpy as np
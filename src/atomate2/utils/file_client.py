@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import os
 import shutil
 import stat
 import warnings
@@ -13,11 +14,23 @@ from pathlib import Path
 from typing import Any, Callable
 
 import paramiko
-from monty.io import zopen
 from paramiko import SFTPClient, SSHClient
 
+try:
+    from isal import igzip
+except ImportError:
+    igzip = None
+
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
 __all__ = ["FileClient", "auto_fileclient"]
 
+_GUNZIP_BUFFER_SIZE = 128 * 1024
+_PARALLEL_GUNZIP_MIN_SIZE = 64 * 1024 * 1024
+
 
 class FileClient:
     """
@@ -408,6 +421,10 @@ class FileClient:
         """
         Ungzip a file.
 
+        Large local files (e.g., wavefunctions) are decompressed in parallel using
+        ``rapidgzip`` if it is installed. Other local files are decompressed using ISA-L
+        (``isal``) if available, falling back to the standard library gzip module.
+
         Parameters
         ----------
         path : str or Path
@@ -428,8 +445,7 @@ class FileClient:
             raise FileExistsError(f"{path_nongz} file already exists")
 
         if host is None:
-            with open(path_nongz, "wb") as f_out, zopen(path, "rb") as f_in:
-                f_out.writelines(f_in)
+            _gunzip_local(path, path_nongz)
             path.unlink()
         else:
             ssh = self.get_ssh(host)
@@ -451,6 +467,62 @@ class FileClient:
         self.close()
 
 
+def _gunzip_local(path: Path, path_nongz: Path):
+    """
+    Decompress a local gzipped file using the fastest available backend.
+
+    Large files are decompressed in parallel using ``rapidgzip`` if it is installed.
+    If that fails, the file is decompressed again with a serial backend, overwriting
+    any partial output.
+
+    Parameters
+    ----------
+    path : Path
+        Path to a gzipped file.
+    path_nongz : Path
+        Path to write the decompressed file to.
+    """
+    if rapidgzip is not None and path.stat().st_size >= _PARALLEL_GUNZIP_MIN_SIZE:
+        try:
+            f_in = rapidgzip.open(str(path), parallelization=_available_cpus())
+            with open(path_nongz, "wb") as f_out, f_in:
+                shutil.copyfileobj(f_in, f_out, length=_GUNZIP_BUFFER_SIZE)
+            return
+        except Exception as exc:
+            warnings.warn(
+                f"Parallel decompression of {path} failed ({exc}), retrying serially"
+            )
+
+    with open(path_nongz, "wb") as f_out, _open_gzip(path) as f_in:
+        shutil.copyfileobj(f_in, f_out, length=_GUNZIP_BUFFER_SIZE)
+
+
+def _open_gzip(path: Path):
+    """
+    Open a local gzipped file for serial reading using the fastest available backend.
+
+    Parameters
+    ----------
+    path : Path
+        Path to a gzipped file.
+
+    Returns
+    -------
+    file-like
+        A binary file object yielding the decompressed data.
+    """
+    if igzip is not None:
+        return igzip.IGzipFile(path, "rb")
+    return GzipFile(path, "rb")
+
+
+def _available_cpus() -> int:
+    """Get the number of CPUs this process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 def get_ssh_connection(
     username: str | None,
     hostname: str,
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
 
 from custodian.vasp.handlers import (
@@ -15,8 +16,6 @@ from custodian.vasp.handlers import (
     StdErrHandler,
     VaspErrorHandler,
 )
-from pymatgen.alchemy.materials import TransformedStructure
-from pymatgen.alchemy.transmuters import StandardTransmuter
 from pymatgen.core.structure import Structure
 
 from atomate2.vasp.jobs.base import BaseVaspMaker, vasp_job
@@ -206,18 +205,27 @@ class NonSCFMaker(BaseVaspMaker):
         """
         self.input_set_generator.mode = mode
 
-        if "parse_dos" not in self.task_document_kwargs:
+        # set the mode dependent defaults on a copy of the maker, so that reusing this
+        # maker with a different mode does not inherit the defaults of this call
+        task_document_kwargs = {
             # parse DOS only for uniform band structure
-            self.task_document_kwargs["parse_dos"] = mode == "uniform"
-
-        if "parse_bandstructure" not in self.task_document_kwargs:
-            self.task_document_kwargs["parse_bandstructure"] = mode
+            "parse_dos": mode == "uniform",
+            "parse_bandstructure": mode,
+            **self.task_document_kwargs,
+        }
 
         # copy previous inputs
-        if "additional_vasp_files" not in self.copy_vasp_kwargs:
-            self.copy_vasp_kwargs["additional_vasp_files"] = ("CHGCAR",)
+        copy_vasp_kwargs = {
+            "additional_vasp_files": ("CHGCAR",),
+            **self.copy_vasp_kwargs,
+        }
 
-        return super().make.original(self, structure, prev_vasp_dir)
+        maker = replace(
+            self,
+            task_document_kwargs=task_document_kwargs,
+            copy_vasp_kwargs=copy_vasp_kwargs,
+        )
+        return super().make.original(maker, structure, prev_vasp_dir)
 
 
 @dataclass
@@ -394,22 +402,26 @@ class HSEBSMaker(BaseVaspMaker):
             )
             mode = "uniform"
 
-        if "parse_dos" not in self.task_document_kwargs:
+        # set the mode dependent defaults on a copy of the maker, so that reusing this
+        # maker with a different mode does not inherit the defaults of this call
+        task_document_kwargs = {
             # parse DOS only for uniform band structure
-            self.task_document_kwargs["parse_dos"] = "uniform" in mode
-
-        if "parse_bandstructure" not in self.task_document_kwargs:
-            parse_bandstructure = "uniform" if mode == "gap" else mode
-            self.task_document_kwargs["parse_bandstructure"] = parse_bandstructure
+            "parse_dos": mode == "uniform",
+            "parse_bandstructure": "uniform" if mode == "gap" else mode,
+            **self.task_document_kwargs,
+        }
 
         # copy previous inputs
-        if (
-            prev_vasp_dir is not None
-            and "additional_vasp_files" not in self.copy_vasp_kwargs
-        ):
-            self.copy_vasp_kwargs["additional_vasp_files"] = ("CHGCAR",)
-
-        return super().make.original(self, structure, prev_vasp_dir)
+        copy_vasp_kwargs = dict(self.copy_vasp_kwargs)
+        if prev_vasp_dir is not None:
+            copy_vasp_kwargs.setdefault("additional_vasp_files", ("CHGCAR",))
+
+        maker = replace(
+            self,
+            task_document_kwargs=task_document_kwargs,
+            copy_vasp_kwargs=copy_vasp_kwargs,
+        )
+        return super().make.original(maker, structure, prev_vasp_dir)
 
 
 @dataclass
@@ -515,17 +527,19 @@ class TransmuterMaker(BaseVaspMaker):
         prev_vasp_dir : str or Path or None
             A previous VASP calculation directory to copy output files from.
         """
+        from pymatgen.alchemy.materials import TransformedStructure
+
         transformations = _get_transformations(
             self.transformations, self.transformation_params
         )
-        ts = TransformedStructure(structure)
-        transmuter = StandardTransmuter([ts], transformations)
-        structure = transmuter.transformed_structures[-1].final_structure
+        tstructure = TransformedStructure(structure)
+        for transformation in transformations:
+            tstructure.append_transformation(transformation)
+        structure = tstructure.final_structure
 
         # to avoid mongoDB errors, ":" is automatically converted to "."
         if "transformations:json" not in self.write_additional_data:
-            tjson = transmuter.transformed_structures[-1]
-            self.write_additional_data["transformations:json"] = tjson
+            self.write_additional_data["transformations:json"] = tstructure
 
         return super().make.original(self, structure, prev_vasp_dir)
 
@@ -597,26 +611,27 @@ def _get_transformations(
 
     transformation_objects = []
     for transformation, transformation_params in zip(transformations, params):
-        found = False
-        for m in (
-            "advanced_transformations",
-            "site_transformations",
-            "standard_transformations",
-        ):
-            from importlib import import_module
-
-            mod = import_module(f"pymatgen.transformations.{m}")
-
-            try:
-                t_cls = getattr(mod, transformation)
-                found = True
-                continue
-            except AttributeError:
-                pass
-
-        if not found:
-            raise ValueError(f"Could not find transformation: {transformation}")
-
+        t_cls = _get_transformation_class(transformation)
         t_obj = t_cls(**transformation_params)
         transformation_objects.append(t_obj)
     return transformation_objects
+
+
+@lru_cache(maxsize=None)
+def _get_transformation_class(transformation: str):
+    """Find a transformation class by name in the pymatgen transformation modules."""
+    from importlib import import_module
+
+    t_cls = None
+    for m in (
+        "advanced_transformations",
+        "site_transformations",
+        "standard_transformations",
+    ):
+        mod = import_module(f"pymatgen.transformations.{m}")
+        t_cls = getattr(mod, transformation, t_cls)
+
+    if t_cls is None:
+        raise ValueError(f"Could not find transformation: {transformation}")
+
+    return t_cls
@@ -0,0 +1,43 @@
+import pytest
+
+
+@pytest.mark.parametrize("charge", [0, 1, -2])
+def test_get_defect_entry_from_tasks_charge(si_structure, charge):
+    import numpy as np
+    from pymatgen.analysis.defects.core import Vacancy
+    from pymatgen.io.vasp import Locpot, Poscar
+
+    from atomate2.cp2k.schemas.defect import DefectDoc
+    from atomate2.cp2k.schemas.task import OutputSummary, TaskDocument
+
+    bulk_structure = si_structure * 2
+    defect = Vacancy(bulk_structure, bulk_structure[0])
+
+    # keep the vacancy as a ghost site, as the ghost vacancy makers do, and set the
+    # charge on the supercell as the defect makers do
+    ghost = [i == 0 for i in range(len(bulk_structure))]
+    defect_structure = bulk_structure.copy(site_properties={"ghost": ghost})
+    defect_structure.set_charge(charge)
+
+    def get_task_doc(structure, energy):
+        task_doc = TaskDocument.construct(
+            structure=structure, output=OutputSummary.construct(energy=energy)
+        )
+        locpot = Locpot(Poscar(structure), {"total": np.zeros((8, 8, 8))})
+        task_doc.cp2k_objects = {"v_hartree": locpot}
+        return task_doc
+
+    entry = DefectDoc.get_defect_entry_from_tasks(
+        defect_task={"defect": defect.as_dict()},
+        bulk_task={},
+        dielectric=10,
+        query="defect",
+        defect_task_doc=get_task_doc(defect_structure, -10.0),
+        bulk_task_doc=get_task_doc(bulk_structure, -12.0),
+    )
+
+    assert entry["charge_state"] == charge
+    if charge:
+        assert entry["corrections"]["freysoldt"] > 0
+    else:
+        assert entry["corrections"] == {}
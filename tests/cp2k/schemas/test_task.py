@@ -0,0 +1,37 @@
+import pytest
+
+
+@pytest.mark.parametrize("filename", ["data.json", "data.json.gz"])
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"a": [1, 2.5, "x"], "b": {"c": null, "d": true}}',
+        '{"a": NaN, "b": Infinity}',
+        '{"z": 123456789012345678901234567890, "y": -18446744073709551617}',
+    ],
+)
+def test_load_json(tmp_dir, filename, content):
+    import gzip
+    import math
+    from pathlib import Path
+
+    from monty.serialization import loadfn
+
+    from atomate2.cp2k.schemas.task import _load_json
+
+    path = Path(filename)
+    if filename.endswith(".gz"):
+        path.write_bytes(gzip.compress(content.encode()))
+    else:
+        path.write_text(content)
+
+    data = _load_json(path)
+    reference = loadfn(path, cls=None)
+
+    assert data.keys() == reference.keys()
+    for key, value in reference.items():
+        if isinstance(value, float) and math.isnan(value):
+            assert math.isnan(data[key])
+        else:
+            assert data[key] == value
+            assert type(data[key]) is type(value)
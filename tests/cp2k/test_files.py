@@ -25,3 +25,53 @@ def test_get_largest_relax_extension(cp2k_test_dir):
     path = cp2k_test_dir / "Si_band_structure" / "static" / "outputs"
     extension = get_largest_relax_extension(directory=path)
     assert extension == ""
+
+
+def test_get_largest_relax_extension_multiple(tmp_dir):
+    from pathlib import Path
+
+    from atomate2.cp2k.files import get_largest_relax_extension
+
+    for name in ("cp2k.out.relax1.gz", "cp2k.out.relax2.gz", "cp2k.out.relax10"):
+        Path(name).touch()
+
+    assert get_largest_relax_extension(directory=".") == ".relax10"
+
+
+def test_copy_cp2k_outputs_restart(tmp_dir):
+    from pathlib import Path
+
+    from atomate2.cp2k.files import copy_cp2k_outputs
+
+    src_dir = Path("src").resolve()
+    src_dir.mkdir()
+    for name in ("cp2k.inp", "cp2k.out", "Si-RESTART.wfn", "Si-RESTART.wfn.bak-1"):
+        (src_dir / name).write_text(name)
+    (src_dir / "Si-1.restart").write_text("restart")
+
+    copy_cp2k_outputs(src_dir=src_dir)
+
+    assert Path("Si-RESTART.wfn").exists()
+    assert not Path("Si-RESTART.wfn.bak-1").exists()
+    assert Path("cp2k.inp").read_text() == "restart"
+
+
+def test_copy_cp2k_outputs_additional_files(tmp_dir):
+    from pathlib import Path
+
+    from atomate2.cp2k.files import copy_cp2k_outputs
+
+    src_dir = Path("src").resolve()
+    src_dir.mkdir()
+    for name in ("cp2k.inp", "cp2k.out", "Si-BAND.bs", "Si-1.dos", "Si-1.ener"):
+        (src_dir / name).write_text(name)
+
+    copy_cp2k_outputs(
+        src_dir=src_dir,
+        additional_cp2k_files=("band_structure", "DOS"),
+        restart_to_input=False,
+    )
+
+    assert Path("Si-BAND.bs").exists()
+    assert Path("Si-1.dos").exists()
+    assert not Path("Si-1.ener").exists()
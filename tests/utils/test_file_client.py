@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.mark.parametrize("size", [0, 1, 200 * 1024 + 7])
+def test_gunzip_round_trip(tmp_dir, size):
+    import gzip
+    import os
+    from pathlib import Path
+
+    from atomate2.utils.file_client import FileClient
+
+    data = os.urandom(size // 2) + b"atomate2\n" * (size // 18)
+    with gzip.open("file.txt.gz", "wb") as f:
+        f.write(data)
+
+    FileClient().gunzip("file.txt.gz")
+
+    assert Path("file.txt").read_bytes() == data
+    assert not Path("file.txt.gz").exists()
+
+
+@pytest.mark.parametrize("fail_on", ["open", "read"])
+def test_gunzip_parallel_fallback(tmp_dir, monkeypatch, fail_on):
+    import gzip
+    import io
+    from pathlib import Path
+
+    from atomate2.utils import file_client
+    from atomate2.utils.file_client import FileClient
+
+    class BrokenReader(io.BytesIO):
+        def read(self, *args):
+            # return some data before failing so a partial file is written
+            if self.tell() == 0:
+                return super().read(5)
+            raise RuntimeError("rapidgzip read failure")
+
+    class BrokenRapidgzip:
+        @staticmethod
+        def open(*args, **kwargs):
+            if fail_on == "open":
+                raise RuntimeError("rapidgzip open failure")
+            return BrokenReader(b"garbage data")
+
+    monkeypatch.setattr(file_client, "rapidgzip", BrokenRapidgzip)
+    monkeypatch.setattr(file_client, "_PARALLEL_GUNZIP_MIN_SIZE", 0)
+
+    data = b"atomate2\n" * 1000
+    with gzip.open("file.txt.gz", "wb") as f:
+        f.write(data)
+
+    with pytest.warns(UserWarning, match="retrying serially"):
+        FileClient().gunzip("file.txt.gz")
+
+    assert Path("file.txt").read_bytes() == data
+    assert not Path("file.txt.gz").exists()
@@ -1,3 +1,4 @@
+import pytest
 from pytest import approx
 
 
@@ -245,3 +246,83 @@ def test_molecular_dynamics(mock_vasp, clean_dir, si_structure):
     # simply check a frame property can be converted to an IonicStep
     for frame in traj.frame_properties:
         IonicStep(**frame)
+
+
+
+@pytest.mark.parametrize(
+    "static_maker_name,bs_maker_name,ref_dir,static_incar_settings",
+    [
+        ("StaticMaker", "NonSCFMaker", "Si_band_structure", {}),
+        ("HSEStaticMaker", "HSEBSMaker", "Si_hse_band_structure", {"KSPACING": 0.4}),
+    ],
+)
+def test_band_structure_maker_reuse(
+    mock_vasp,
+    clean_dir,
+    si_structure,
+    static_maker_name,
+    bs_maker_name,
+    ref_dir,
+    static_incar_settings,
+):
+    from jobflow import Flow, run_locally
+    from pymatgen.electronic_structure.bandstructure import BandStructureSymmLine
+
+    from atomate2.vasp.jobs import core
+    from atomate2.vasp.schemas.calculation import VaspObject
+
+    static_maker = getattr(core, static_maker_name)()
+    bs_maker = getattr(core, bs_maker_name)()
+
+    # mapping from job name to directory containing test files
+    ref_paths = {
+        name: f"{ref_dir}/{name.replace(' ', '_')}"
+        for name in (
+            static_maker.name,
+            f"{bs_maker.name} uniform",
+            f"{bs_maker.name} line",
+        )
+    }
+
+    # settings passed to fake_run_vasp; adjust these to check for certain INCAR settings
+    fake_run_vasp_kwargs = {k: {"incar_settings": ["NSW", "ISMEAR"]} for k in ref_paths}
+
+    # automatically use fake VASP and write POTCAR.spec during the test
+    mock_vasp(ref_paths, fake_run_vasp_kwargs)
+
+    # generate and run the static and uniform jobs
+    static_job = static_maker.make(si_structure)
+    static_job.maker.input_set_generator.user_incar_settings.update(
+        static_incar_settings
+    )
+    uniform_job = bs_maker.make(
+        static_job.output.structure,
+        prev_vasp_dir=static_job.output.dir_name,
+        mode="uniform",
+    )
+    uniform_job.name += " uniform"
+    flow = Flow([static_job, uniform_job])
+    responses = run_locally(flow, create_folders=True, ensure_success=True)
+    static_output = responses[static_job.uuid][1].output
+    uniform_output = responses[uniform_job.uuid][1].output
+
+    # reuse the maker that ran the uniform job; the line job must not inherit the
+    # settings of the uniform job
+    maker = uniform_job.maker
+    assert maker.task_document_kwargs == {}
+    line_job = maker.make(
+        static_output.structure, prev_vasp_dir=static_output.dir_name, mode="line"
+    )
+    line_job.name = f"{bs_maker.name} line"
+
+    # run the job and ensure that it finished running successfully; this also
+    # checks the KPOINTS written for the line mode
+    responses = run_locally(line_job, create_folders=True, ensure_success=True)
+    line_output = responses[line_job.uuid][1].output
+
+    # validation on the outputs
+    assert VaspObject.DOS in uniform_output.vasp_objects
+    assert set(line_output.vasp_objects) == {VaspObject.BANDSTRUCTURE}
+    assert isinstance(
+        line_output.vasp_objects[VaspObject.BANDSTRUCTURE], BandStructureSymmLine
+    )